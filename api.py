@@ -1,11 +1,17 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+from typing import AsyncIterator, Dict, Any, List, Optional
 from datetime import datetime
 import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 
-from flow_manager import FlowManager, FlowExecutionState, TaskStatus, FlowStatus
+import orjson
+
+from flow_manager import FlowManager, FlowExecutionState
 
 
 class TaskConfig(BaseModel):
@@ -13,6 +19,8 @@ class TaskConfig(BaseModel):
     description: Optional[str] = None
     task_type: str
     parameters: Dict[str, Any] = {}
+    # None means "after the previous task"; [] means no dependencies.
+    depends_on: Optional[List[str]] = None
 
 
 class ConditionConfig(BaseModel):
@@ -31,12 +39,28 @@ class FlowConfig(BaseModel):
     tasks: List[TaskConfig]
     conditions: List[ConditionConfig]
 
+    @model_validator(mode="after")
+    def check_dependencies(self) -> "FlowConfig":
+        task_names = set()
+        for task in self.tasks:
+            if task.name in task_names:
+                raise ValueError(f"Duplicate task name '{task.name}'")
+            task_names.add(task.name)
+        for task in self.tasks:
+            for dependency in task.depends_on or []:
+                if dependency not in task_names:
+                    raise ValueError(f"Task '{task.name}' depends on unknown task '{dependency}'")
+        return self
+
 
-class FlowExecutionRequest(BaseModel):
-    execution_id: str = Field(..., description="Flow execution ID")
+class BatchStatusRequest(BaseModel):
+    execution_ids: List[str] = Field(..., description="Flow execution IDs to report on")
 
 
 class FlowExecutionResponse(BaseModel):
+    # Response-only model; never copy or revalidate instances passed into it.
+    model_config = ConfigDict(frozen=True, revalidate_instances="never")
+
     execution_id: str
     flow_name: str
     status: str
@@ -47,85 +71,185 @@ class FlowExecutionResponse(BaseModel):
     task_results: Dict[str, Dict[str, Any]] = {}
 
 
-app = FastAPI(title="Flow Manager API")
+flow_manager = FlowManager(max_flows=int(os.environ.get("FLOW_MAX_EXECUTIONS", "10000")))
+logger = logging.getLogger(__name__)
+
+# Number of long-running workers draining the execution queue. This also
+# bounds how many flows run concurrently.
+EXECUTION_WORKERS = int(os.environ.get("FLOW_EXECUTION_WORKERS", "4"))
+
+
+def serialize_execution_state(state: FlowExecutionState) -> Dict[str, Any]:
+    # FlowExecutionState is produced by FlowManager itself, so it is trusted and
+    # is handed to orjson as is instead of going through pydantic.
+    # Only request bodies (FlowConfig, BatchStatusRequest) are validated.
+    # The shape matches FlowExecutionResponse, which documents it in OpenAPI.
+    return {
+        "execution_id": state.flow_id,
+        "flow_name": state.flow_name,
+        "status": state.status.value if state.status else None,
+        "current_task": state.current_task,
+        "completed_tasks": state.completed_tasks,
+        "started_at": state.started_at,
+        "ended_at": state.ended_at,
+        # flow_manager.TaskResult is a dataclass and its status an Enum, both
+        # of which orjson encodes natively, so no per-task dict is built here.
+        "task_results": state.task_results,
+    }
+
+
+def serialized_execution_state(state: FlowExecutionState) -> bytes:
+    # The encoded body is kept on the state, tagged with the version it was
+    # built from, so polling an unchanged flow skips serialization and the
+    # cache goes away with the state when it is deleted or evicted.
+    cached = state.serialized
+    if cached is not None and cached[0] == state.version:
+        return cached[1]
+    body = orjson.dumps(
+        serialize_execution_state(state),
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+    state.serialized = (state.version, body)
+    return body
 
-flow_manager = FlowManager()
 
+async def execution_worker(queue: asyncio.Queue):
+    while True:
+        execution_id, flow_config = await queue.get()
+        try:
+            final_state = await flow_manager.execute_flow(execution_id, flow_config)
+            # A finished flow never changes again, so snapshot its response now
+            # and every later poll is served straight from the cache.
+            serialized_execution_state(final_state)
+        except Exception:
+            logger.exception("Background execution of flow %s failed", execution_id)
+        finally:
+            queue.task_done()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.exec_queue = asyncio.Queue()
+    workers = [
+        asyncio.create_task(execution_worker(app.state.exec_queue))
+        for _ in range(EXECUTION_WORKERS)
+    ]
+    yield
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+
+app = FastAPI(title="Flow Manager API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# /flow/create parses its own body, so FastAPI never sees FlowConfig; its
+# schema and the models it refers to are added to the components here.
+_FLOW_CONFIG_SCHEMA = FlowConfig.model_json_schema(ref_template="#/components/schemas/{model}")
+_FLOW_CONFIG_DEFS = {**_FLOW_CONFIG_SCHEMA.pop("$defs", {}), "FlowConfig": _FLOW_CONFIG_SCHEMA}
+
+
+def openapi() -> Dict[str, Any]:
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_FLOW_CONFIG_DEFS)
+    return app.openapi_schema
 
-def serialize_execution_state(state: FlowExecutionState) -> FlowExecutionResponse:
-    task_results = {}
-    for task_name, result in state.task_results.items():
-        task_results[task_name] = {
-            "task_name": result.task_name,
-            "status": result.status.value if result.status else None,
-            "message": result.message,
-            "data": result.data,
-            "execution_time": result.execution_time,
-            "timestamp": result.timestamp,
-            "error": result.error,
-        }
-    return FlowExecutionResponse(
-        execution_id=state.flow_id,
-        flow_name=state.flow_name,
-        status=state.status.value if state.status else None,
-        current_task=state.current_task,
-        completed_tasks=state.completed_tasks,
-        started_at=state.started_at,
-        ended_at=state.ended_at,
-        task_results=task_results,
-    )
+
+app.openapi = openapi
+
+# The root payload never changes, so encode it once at import time.
+_ROOT_BYTES = orjson.dumps({"message": "Flow Manager API is running"})
 
 
 @app.get("/")
 async def root():
-    return {"message": "Flow Manager API is running"}
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow()}
+    return ORJSONResponse({"status": "healthy", "timestamp": datetime.utcnow()})
 
 
-@app.post("/flow/create", response_model=Dict[str, str])
-async def create_flow(flow_config: FlowConfig):
-    try:
-        # Changed from .dict() to .model_dump() here
-        flow_obj = flow_manager.load_flow_config(flow_config.model_dump())
-        execution_id = flow_manager.create_flow_execution(flow_obj)
-        return {
-            "execution_id": execution_id,
-            "flow_name": flow_config.name,
-            "status": "created",
-            "message": "Flow created successfully"
+@app.post(
+    "/flow/create",
+    responses={200: {"model": Dict[str, str]}},
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/FlowConfig"}}},
+            "required": True,
         }
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to create flow: {str(e)}")
-
-
-@app.post("/flow/execute", response_model=FlowExecutionResponse)
-async def execute_flow_async(background_tasks: BackgroundTasks, request: FlowExecutionRequest):
-    execution_id = request.execution_id
-    execution_state = flow_manager.get_flow_status(execution_id)
+    },
+)
+async def create_flow(request: Request):
+    # Validate the raw body in pydantic-core instead of letting FastAPI
+    # json.loads() it into a dict first.
+    try:
+        flow_config = FlowConfig.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
+
+    # Bad input has been rejected above; anything raised from here on is a
+    # server-side bug and is left to the general exception handler.
+    flow_obj = flow_manager.load_flow_config_from_model(flow_config)
+    execution_id = flow_manager.create_flow_execution(flow_obj)
+    return ORJSONResponse({
+        "execution_id": execution_id,
+        "flow_name": flow_config.name,
+        "status": "created",
+        "message": "Flow created successfully"
+    })
+
+
+@app.post("/flow/{execution_id}/execute", responses={200: {"model": FlowExecutionResponse}})
+async def execute_flow_async(execution_id: str):
+    execution_state, flow_config = flow_manager.get_flow_with_config(execution_id)
     if not execution_state:
         raise HTTPException(status_code=404, detail=f"Flow execution {execution_id} not found")
-
-    flow_config = flow_manager.get_flow_config(execution_id)
     if flow_config is None:
         raise HTTPException(status_code=400, detail="Flow configuration not found for execution")
 
-    async def run_execution():
-        await flow_manager.execute_flow(execution_id, flow_config)
-
-    background_tasks.add_task(run_execution)
-    return serialize_execution_state(execution_state)
-
-
-@app.get("/flow/{execution_id}/status", response_model=FlowExecutionResponse)
+    await app.state.exec_queue.put((execution_id, flow_config))
+    return ORJSONResponse(serialize_execution_state(execution_state))
+
+
+@app.get("/flows", responses={200: {"model": List[FlowExecutionResponse]}})
+async def list_all_flows():
+    # Stream the array one execution at a time instead of building the whole
+    # list in memory before the first byte goes out.
+    async def stream() -> AsyncIterator[bytes]:
+        # Snapshot the states first: flows may be created or deleted while the
+        # response is being sent.
+        states = list(flow_manager.get_all_flows().values())
+        yield b"["
+        for index, state in enumerate(states):
+            if index:
+                yield b","
+            yield serialized_execution_state(state)
+        yield b"]"
+
+    return StreamingResponse(stream(), media_type="application/json")
+
+
+@app.post("/flows/status", responses={200: {"model": Dict[str, Optional[FlowExecutionResponse]]}})
+async def get_flows_status(request: BatchStatusRequest):
+    # One round trip for many pollers. Each status is spliced in from the
+    # per-version cache; unknown IDs map to null. Repeated IDs are sent once
+    # so the object never carries duplicate keys.
+    parts = []
+    for execution_id in dict.fromkeys(request.execution_ids):
+        execution_state = flow_manager.get_flow_status(execution_id)
+        body = serialized_execution_state(execution_state) if execution_state else b"null"
+        parts.append(orjson.dumps(execution_id) + b":" + body)
+    return Response(content=b"{" + b",".join(parts) + b"}", media_type="application/json")
+
+
+@app.get("/flow/{execution_id}/status", responses={200: {"model": FlowExecutionResponse}})
 async def get_flow_status(execution_id: str):
     execution_state = flow_manager.get_flow_status(execution_id)
     if not execution_state:
         raise HTTPException(status_code=404, detail=f"Flow execution {execution_id} not found")
-    return serialize_execution_state(execution_state)
+    return Response(content=serialized_execution_state(execution_state), media_type="application/json")
 
 
 @app.delete("/flow/{execution_id}")
@@ -133,7 +257,7 @@ async def delete_flow(execution_id: str):
     success = flow_manager.remove_flow(execution_id)
     if not success:
         raise HTTPException(status_code=404, detail=f"Flow execution {execution_id} not found")
-    return {"message": f"Flow execution {execution_id} deleted successfully"}
+    return ORJSONResponse({"message": f"Flow execution {execution_id} deleted successfully"})
 
 
 @app.exception_handler(Exception)
@@ -143,5 +267,16 @@ async def general_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # Flow state lives in this process's FlowManager, so more than one worker
+    # only makes sense once that state is moved to a shared store.
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+        access_log=False,
+    )
 
@@ -0,0 +1,25 @@
+"""
+Flow Manager Enums
+
+This module defines the task and flow status enums shared by every part of
+the flow manager system. Their values are the strings reported by the API.
+"""
+
+from enum import Enum
+
+
+class TaskStatus(Enum):
+    """Enumeration for task execution status"""
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCESS = "SUCCESS"
+    FAILURE = "FAILURE"
+    SKIPPED = "SKIPPED"
+
+
+class FlowStatus(Enum):
+    """Enumeration for flow execution status"""
+    CREATED = "CREATED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
@@ -1,45 +1,53 @@
 import uuid
 import asyncio
 import importlib
+import json
 import logging
-from typing import Dict, Any, Optional, List
+import os
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Mapping, Optional, List, Tuple
 from datetime import datetime
-from enum import Enum
+from dataclasses import dataclass, field
+
+from enums import TaskStatus, FlowStatus
 
 # Configure logging at the module level
 logging.basicConfig(
-    level=logging.DEBUG,  # Adjust this to INFO or WARNING in production
+    level=os.environ.get("LOG_LEVEL", "DEBUG"),  # Set LOG_LEVEL=INFO or WARNING in production
     format='[%(asctime)s] %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
-
-class TaskStatus(Enum):
-    SUCCESS = "SUCCESS"
-    FAILURE = "FAILURE"
-    SKIPPED = "SKIPPED"
-
-
-class FlowStatus(Enum):
-    CREATED = "CREATED"
-    RUNNING = "RUNNING"
-    COMPLETED = "COMPLETED"
-    FAILED = "FAILED"
+# Prefer uvloop's libuv-based event loop when it is installed.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 
+# A dataclass so orjson can serialize it natively; the field names are the
+# task result shape returned by the API.
+@dataclass(slots=True)
 class TaskResult:
-    def __init__(self, task_name: str):
-        self.task_name = task_name
-        self.status: Optional[TaskStatus] = None
-        self.message: str = ""
-        self.data: Dict[str, Any] = {}
-        self.execution_time: float = 0.0
-        self.timestamp: Optional[datetime] = None
-        self.error: Optional[str] = None
+    task_name: str
+    status: Optional[TaskStatus] = None
+    message: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)
+    execution_time: float = 0.0
+    timestamp: Optional[datetime] = None
+    error: Optional[str] = None
 
 
 class FlowExecutionState:
+    __slots__ = (
+        "flow_id", "flow_name", "status", "current_task", "completed_tasks",
+        "started_at", "ended_at", "task_results", "version", "serialized",
+    )
+
     def __init__(self, flow_id: str, flow_name: str):
         self.flow_id = flow_id
         self.flow_name = flow_name
@@ -49,12 +57,66 @@ class FlowExecutionState:
         self.started_at: Optional[datetime] = None
         self.ended_at: Optional[datetime] = None
         self.task_results: Dict[str, TaskResult] = {}
+        # Bumped on every mutation so readers can cache serialized snapshots.
+        self.version: int = 0
+        # (version, encoded body) kept by the API; dropped with the state.
+        self.serialized: Optional[Tuple[int, bytes]] = None
+
+
+# A flow config compiled once, at creation, into the lookups execute_flow needs.
+@dataclass(frozen=True)
+class FlowPlan:
+    config: Dict[str, Any]
+    tasks_by_name: Mapping[str, Dict[str, Any]]
+    dependencies: Mapping[str, FrozenSet[str]]
+
+    @classmethod
+    def compile(cls, config: Dict[str, Any]) -> "FlowPlan":
+        # A task without "depends_on" waits for the task listed before it, which
+        # keeps plain task lists sequential. An explicit list (possibly empty)
+        # lets independent tasks run side by side.
+        tasks_by_name = {}
+        dependencies = {}
+        previous = None
+        for task in config["tasks"]:
+            depends_on = task.get("depends_on")
+            if depends_on is None:
+                depends_on = [previous] if previous else []
+            tasks_by_name[task["name"]] = task
+            dependencies[task["name"]] = frozenset(depends_on)
+            previous = task["name"]
+        return cls(
+            config=config,
+            tasks_by_name=MappingProxyType(tasks_by_name),
+            dependencies=MappingProxyType(dependencies),
+        )
 
 
 class FlowManager:
-    def __init__(self):
-        self.flows: Dict[str, FlowExecutionState] = {}
+    # Upper bound on memoized results of cacheable tasks.
+    MEMO_SIZE = 1024
+    # task_type -> task class, filled the first time each type is used.
+    _task_class_cache: Dict[str, type] = {}
+    # Statuses after which an execution never changes and may be evicted.
+    FINISHED_STATUSES = (FlowStatus.COMPLETED, FlowStatus.FAILED)
+    # Default cap on how many tasks of one type run at once, across all flows.
+    MAX_WORKERS_PER_TYPE = 10
+
+    def __init__(self, max_flows: int = 10_000):
+        # Least recently used first. Once more than max_flows executions are
+        # held, the oldest finished ones are evicted; running flows never are.
+        self.max_flows = max_flows
+        self.flows: "OrderedDict[str, FlowExecutionState]" = OrderedDict()
         self.flow_configs: Dict[str, Dict[str, Any]] = {}
+        self.flow_plans: Dict[str, FlowPlan] = {}
+        # (task_type, parameters) -> future of the task's result data, for task
+        # classes marked cacheable. Concurrent identical runs share one future.
+        self._memo: "OrderedDict[Tuple[str, str], asyncio.Future]" = OrderedDict()
+        # Per task_type overrides of MAX_WORKERS_PER_TYPE, and the semaphores
+        # that enforce them (created on first use, inside the running loop).
+        self.max_workers_per_type: Dict[str, int] = {}
+        # task_type -> (limit it was built with, semaphore)
+        self._type_semaphores: Dict[str, Tuple[int, asyncio.Semaphore]] = {}
 
     def load_flow_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
         if "id" not in config or "name" not in config or "tasks" not in config:
@@ -62,35 +124,181 @@ class FlowManager:
         for task in config["tasks"]:
             if "task_type" not in task:
                 raise ValueError(f"Task '{task.get('name', '')}' missing 'task_type'")
+        task_names = set()
+        for task in config["tasks"]:
+            if task.get("name") in task_names:
+                raise ValueError(f"Duplicate task name '{task.get('name')}'")
+            task_names.add(task.get("name"))
+        for task in config["tasks"]:
+            for dependency in task.get("depends_on") or []:
+                if dependency not in task_names:
+                    raise ValueError(f"Task '{task.get('name', '')}' depends on unknown task '{dependency}'")
         return config
 
+    def load_flow_config_from_model(self, flow_config: Any) -> Dict[str, Any]:
+        # The model has already been validated by pydantic, so the key checks in
+        # load_flow_config would be redundant; dump it once and use it as is.
+        return flow_config.model_dump(mode="python")
+
     def create_flow_execution(self, flow_config: Dict[str, Any]) -> str:
         execution_id = str(uuid.uuid4())
         flow_name = flow_config.get("name", "UnnamedFlow")
         self.flow_configs[execution_id] = flow_config
+        self.flow_plans[execution_id] = FlowPlan.compile(flow_config)
         state = FlowExecutionState(flow_id=execution_id, flow_name=flow_name)
         self.flows[execution_id] = state
-        logger.info(f"Created new flow execution: {execution_id} for flow '{flow_name}'")
+        logger.info("Created new flow execution: %s for flow '%s'", execution_id, flow_name)
+        # Evict until back under the cap, which may take several evictions if
+        # it was exceeded while every flow was still running.
+        while len(self.flows) > self.max_flows:
+            if not self._evict_finished_flow():
+                break
         return execution_id
 
+    def _evict_finished_flow(self) -> bool:
+        for execution_id, state in self.flows.items():
+            if state.status in self.FINISHED_STATUSES:
+                break
+        else:
+            logger.warning("Holding %d flow executions; none are finished, so none were evicted", len(self.flows))
+            return False
+        del self.flows[execution_id]
+        self.flow_configs.pop(execution_id, None)
+        self.flow_plans.pop(execution_id, None)
+        logger.info("Evicted finished flow execution %s", execution_id)
+        return True
+
     def get_flow_status(self, execution_id: str) -> Optional[FlowExecutionState]:
-        return self.flows.get(execution_id)
+        state = self.flows.get(execution_id)
+        if state is not None:
+            self.flows.move_to_end(execution_id)
+        return state
+
+    def get_all_flows(self) -> Mapping[str, FlowExecutionState]:
+        # Read-only view, not a copy; callers that iterate across awaits must
+        # take their own snapshot.
+        return MappingProxyType(self.flows)
 
     def get_flow_config(self, execution_id: str) -> Optional[Dict[str, Any]]:
         return self.flow_configs.get(execution_id)
 
+    def get_flow_with_config(self, execution_id: str) -> Tuple[Optional[FlowExecutionState], Optional[Dict[str, Any]]]:
+        return self.flows.get(execution_id), self.flow_configs.get(execution_id)
+
     def remove_flow(self, execution_id: str) -> bool:
         existed = False
         if execution_id in self.flows:
             del self.flows[execution_id]
             existed = True
-            logger.info(f"Deleted flow state for execution ID {execution_id}")
+            logger.info("Deleted flow state for execution ID %s", execution_id)
         if execution_id in self.flow_configs:
             del self.flow_configs[execution_id]
-            logger.info(f"Deleted flow config for execution ID {execution_id}")
+            logger.info("Deleted flow config for execution ID %s", execution_id)
             existed = True
+        self.flow_plans.pop(execution_id, None)
         return existed
 
+    def _plan_for(self, execution_id: str, flow_config: Dict[str, Any]) -> FlowPlan:
+        plan = self.flow_plans.get(execution_id)
+        if plan is None or plan.config is not flow_config:
+            plan = FlowPlan.compile(flow_config)
+            self.flow_plans[execution_id] = plan
+        return plan
+
+    @classmethod
+    def _resolve(cls, task_type: str) -> type:
+        task_class = cls._task_class_cache.get(task_type)
+        if task_class is None:
+            module_name = f"tasks.task_{task_type.lower()}"
+            class_name = ''.join(part.capitalize() for part in task_type.split('_')) + "Task"
+            logger.debug("Loading %s from %s", class_name, module_name)
+            module = importlib.import_module(module_name)
+            task_class = getattr(module, class_name)
+            cls._task_class_cache[task_type] = task_class
+        return task_class
+
+    async def _run_instance(self, task_type: str, task_instance: Any) -> Dict[str, Any]:
+        # Task classes opt in with cacheable; individual tasks with a truthy
+        # "memoize" parameter, which is then part of the key like any other.
+        if not (task_instance.cacheable or task_instance.parameters.get("memoize")):
+            return await task_instance.run()
+
+        key = (task_type, json.dumps(task_instance.parameters, sort_keys=True, default=str))
+        future = self._memo.get(key)
+        if future is not None and self._failed(future):
+            # A run that failed after its awaiters went away is not a result;
+            # drop it so this call runs the task again.
+            del self._memo[key]
+            future = None
+        if future is not None:
+            self._memo.move_to_end(key)
+            logger.debug("Reusing cached result for task '%s' of type '%s'", task_instance.name, task_type)
+        else:
+            future = asyncio.ensure_future(task_instance.run())
+            self._memo[key] = future
+            if len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+        try:
+            if future.done():
+                return future.result()
+            return await asyncio.shield(future)
+        except BaseException:
+            # Only successful results are kept. A cancelled awaiter leaves a
+            # still-running future in place for the others sharing it.
+            if self._memo.get(key) is future and self._failed(future):
+                del self._memo[key]
+            raise
+
+    @staticmethod
+    def _failed(future: asyncio.Future) -> bool:
+        return future.done() and (future.cancelled() or future.exception() is not None)
+
+    async def _run_bounded(self, state: FlowExecutionState, task: Dict[str, Any]) -> TaskResult:
+        task_type = task["task_type"]
+        limit = self.max_workers_per_type.get(task_type, self.MAX_WORKERS_PER_TYPE)
+        built_with, semaphore = self._type_semaphores.get(task_type, (None, None))
+        if built_with != limit:
+            # A changed limit applies to tasks started from now on; ones
+            # already holding the old semaphore finish under it.
+            semaphore = asyncio.Semaphore(limit)
+            self._type_semaphores[task_type] = (limit, semaphore)
+        async with semaphore:
+            return await self._run_task(state, task)
+
+    async def _run_task(self, state: FlowExecutionState, task: Dict[str, Any]) -> TaskResult:
+        task_name = task["name"]
+        task_type = task["task_type"]
+        parameters = task.get("parameters", {})
+
+        state.current_task = task_name
+        state.version += 1
+        task_result = TaskResult(task_name=task_name)
+        # Durations come from the monotonic clock; the only wall-clock read per
+        # task is the completion timestamp the API reports.
+        started_ns = time.monotonic_ns()
+
+        try:
+            logger.debug("Loading task '%s' of type '%s' with parameters %r", task_name, task_type, parameters)
+            task_class = FlowManager._resolve(task_type)
+
+            task_instance = task_class(name=task_name, parameters=parameters)
+            logger.debug("Executing task '%s'...", task_name)
+            result_data = await self._run_instance(task_type, task_instance)
+            logger.info("Task '%s' completed successfully with result: %s", task_name, result_data)
+
+            task_result.status = TaskStatus.SUCCESS
+            task_result.message = "Completed successfully"
+            task_result.data = result_data
+            task_result.timestamp = datetime.utcnow()
+
+        except Exception as e:
+            logger.error("Task '%s' failed with error: %s", task_name, e)
+            task_result.status = TaskStatus.FAILURE
+            task_result.error = str(e)
+
+        task_result.execution_time = (time.monotonic_ns() - started_ns) / 1e9
+        return task_result
+
     async def execute_flow(self, execution_id: str, flow_config: Dict[str, Any]) -> FlowExecutionState:
         if execution_id not in self.flows:
             raise ValueError("Execution ID not found")
@@ -98,54 +306,66 @@ class FlowManager:
         state = self.flows[execution_id]
         state.status = FlowStatus.RUNNING
         state.started_at = datetime.utcnow()
-        logger.info(f"Started execution of flow '{state.flow_name}' with ID {execution_id}")
-
-        tasks = flow_config["tasks"]
-
-        for task in tasks:
-            task_name = task["name"]
-            task_type = task["task_type"]
-            parameters = task.get("parameters", {})
-
-            state.current_task = task_name
-            task_result = TaskResult(task_name=task_name)
-
-            try:
-                logger.debug(f"Loading task '{task_name}' of type '{task_type}' with parameters {parameters}")
-                module_name = f"tasks.task_{task_type.lower()}"
-                class_name = ''.join(part.capitalize() for part in task_type.split('_')) + "Task"
-                module = importlib.import_module(module_name)
-                task_class = getattr(module, class_name)
-                logger.debug(f"Instantiating {class_name} from {module_name}")
-
-                task_instance = task_class(name=task_name, parameters=parameters)
-                logger.debug(f"Executing task '{task_name}'...")
-                result_data = await task_instance.run()
-                logger.info(f"Task '{task_name}' completed successfully with result: {result_data}")
-
-                task_result.status = TaskStatus.SUCCESS
-                task_result.message = "Completed successfully"
-                task_result.data = result_data
-
-            except Exception as e:
-                logger.error(f"Task '{task_name}' failed with error: {e}")
-                task_result.status = TaskStatus.FAILURE
-                task_result.error = str(e)
-                state.task_results[task_name] = task_result
-                state.status = FlowStatus.FAILED
-                state.ended_at = datetime.utcnow()
-                logger.warning(f"Flow execution {execution_id} failed during task '{task_name}'")
-                return state
+        state.version += 1
+        logger.info("Started execution of flow '%s' with ID %s", state.flow_name, execution_id)
 
-            task_result.timestamp = datetime.utcnow()
-            state.task_results[task_name] = task_result
-            state.completed_tasks.append(task_name)
+        plan = self._plan_for(execution_id, flow_config)
+        dependencies = plan.dependencies
+        pending = dict(plan.tasks_by_name)
+        done = set()
+        # Started tasks, in start order, mapped to their names.
+        running: Dict[asyncio.Future, str] = {}
+        failed = None
+
+        # Each task starts as soon as its own dependencies have succeeded, so
+        # wall time follows the critical path instead of waiting on unrelated
+        # slow tasks. Tasks of the same type are additionally capped by a
+        # per-type semaphore so a wide flow can't flood whatever that task
+        # type talks to. After a failure nothing new is started; tasks already
+        # running finish and are recorded before the flow is marked failed.
+        try:
+            while True:
+                if failed is None:
+                    for name in [name for name in pending if dependencies[name] <= done]:
+                        running[asyncio.ensure_future(self._run_bounded(state, pending.pop(name)))] = name
+                if not running:
+                    break
 
-        all_success = all(tr.status == TaskStatus.SUCCESS for tr in state.task_results.values())
-        state.status = FlowStatus.COMPLETED if all_success else FlowStatus.FAILED
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in [future for future in running if future in finished]:
+                    del running[future]
+                    task_result = future.result()
+                    state.task_results[task_result.task_name] = task_result
+                    if task_result.status == TaskStatus.SUCCESS:
+                        state.completed_tasks.append(task_result.task_name)
+                        done.add(task_result.task_name)
+                    elif failed is None:
+                        failed = task_result
+                state.version += 1
+        finally:
+            for future in running:
+                future.cancel()
+
+        if failed is not None:
+            state.current_task = failed.task_name
+            state.status = FlowStatus.FAILED
+            state.ended_at = datetime.utcnow()
+            state.version += 1
+            logger.warning("Flow execution %s failed during task '%s'", execution_id, failed.task_name)
+            return state
+
+        if pending:
+            logger.error("Flow execution %s has unsatisfiable dependencies for %s", execution_id, list(pending))
+            state.status = FlowStatus.FAILED
+            state.ended_at = datetime.utcnow()
+            state.version += 1
+            return state
+
+        # Failures and unsatisfiable dependencies return above.
+        state.status = FlowStatus.COMPLETED
         state.current_task = None
         state.ended_at = datetime.utcnow()
-        logger.info(f"Flow execution {execution_id} completed with status {state.status.value}")
+        state.version += 1
+        logger.info("Flow execution %s completed with status %s", execution_id, state.status.value)
 
         return state
-
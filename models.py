@@ -1,36 +1,19 @@
 """
 Flow Manager Models
 
-This module defines the core data models, enums, and data structures
-used throughout the flow manager system.
+This module defines the core data models and data structures used
+throughout the flow manager system. The status enums live in enums.py.
 """
 
-from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+from enums import TaskStatus, FlowStatus
 
-class TaskStatus(Enum):
-    """Enumeration for task execution status"""
-    PENDING = "pending"
-    RUNNING = "running" 
-    SUCCESS = "success"
-    FAILURE = "failure"
-    SKIPPED = "skipped"
 
-
-class FlowStatus(Enum):
-    """Enumeration for flow execution status"""
-    CREATED = "created"
-    RUNNING = "running"
-    SUCCESS = "success"
-    FAILURE = "failure"
-    ENDED = "ended"
-
-
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Represents the result of a task execution"""
     task_name: str
@@ -48,7 +31,7 @@ class TaskResult:
             self.timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class FlowExecutionState:
     """Represents the current state of flow execution"""
     flow_id: str
@@ -69,7 +52,7 @@ class FlowExecutionState:
             self.started_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskConfig:
     """Configuration for a single task"""
     name: str
@@ -82,7 +65,7 @@ class TaskConfig:
             self.parameters = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class ConditionConfig:
     """Configuration for a condition that determines flow control"""
     name: str
@@ -93,7 +76,7 @@ class ConditionConfig:
     target_task_failure: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FlowConfig:
     """Configuration for an entire flow"""
     id: str
@@ -101,20 +84,26 @@ class FlowConfig:
     start_task: str
     tasks: List[TaskConfig]
     conditions: List[ConditionConfig]
+    _task_index: Dict[str, TaskConfig] = field(init=False, repr=False, compare=False)
+    _condition_index: Dict[str, ConditionConfig] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Index tasks and conditions once; the lookups below run on every
+        # transition. The first condition for a source task wins, as before.
+        self._task_index = {}
+        for task in self.tasks:
+            self._task_index.setdefault(task.name, task)
+        self._condition_index = {}
+        for condition in self.conditions:
+            self._condition_index.setdefault(condition.source_task, condition)
 
     def get_task_by_name(self, task_name: str) -> Optional[TaskConfig]:
         """Get task configuration by name"""
-        for task in self.tasks:
-            if task.name == task_name:
-                return task
-        return None
+        return self._task_index.get(task_name)
 
     def get_condition_for_task(self, task_name: str) -> Optional[ConditionConfig]:
         """Get condition configuration for a specific task"""
-        for condition in self.conditions:
-            if condition.source_task == task_name:
-                return condition
-        return None
+        return self._condition_index.get(task_name)
 
 
 class BaseTask(ABC):
@@ -1,7 +1,16 @@
+import random
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 
 class BaseTask(ABC):
+    # Set to True on tasks whose result depends only on their parameters (not on
+    # their name or any outside state); FlowManager then reuses the result of an
+    # earlier run with the same task type and parameters instead of running again.
+    cacheable: bool = False
+    # One generator shared by all tasks for simulated failures; seed it to make
+    # runs reproducible.
+    rng: random.Random = random.Random()
+
     def __init__(self, name: str, parameters: Dict[str, Any]):
         self.name = name
         self.parameters = parameters
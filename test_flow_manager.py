@@ -86,11 +86,8 @@ async def test_flow_manager():
             print(f"\n❌ Task execution mismatch. Expected: {expected_tasks}, Got: {actual_tasks}")
             return False
 
-        # Compare enum value for accurate status check
-        status_value = execution_state.status.value.upper()
-        print(f"DEBUG: Flow status value for comparison: {status_value}")
-
-        if status_value == "COMPLETED":
+        # models and flow_manager share one FlowStatus, so compare by identity
+        if execution_state.status is FlowStatus.COMPLETED:
             print("✅ Flow completed successfully")
             return True
         else:
@@ -146,10 +143,7 @@ async def test_flow_with_failure():
         print(f"Flow Status: {execution_state.status} (type: {type(execution_state.status)})")
         print(f"Completed Tasks: {execution_state.completed_tasks}")
 
-        status_value = execution_state.status.value.upper()
-        print(f"DEBUG: Flow status value for comparison: {status_value}")
-
-        if len(execution_state.completed_tasks) == 1 and status_value == "FAILED":
+        if len(execution_state.completed_tasks) == 1 and execution_state.status is FlowStatus.FAILED:
             print("✅ Flow correctly stopped after task failure")
             return True
         else:
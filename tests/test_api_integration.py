@@ -2,15 +2,20 @@ import pytest
 from fastapi.testclient import TestClient
 from api import app
 
-client = TestClient(app)
+# Use the client as a context manager so startup runs and the execution
+# workers stay alive across requests.
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
 
-def test_health_check():
+def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
 
-def test_create_execute_and_status_flow():
+def test_create_execute_and_status_flow(client):
     flow_config = {
         "id": "api_flow_1",
         "name": "API Flow Test",
@@ -27,7 +32,7 @@ def test_create_execute_and_status_flow():
     exec_id = create_resp.json().get("execution_id")
     assert exec_id
 
-    execute_resp = client.post("/flow/execute", json={"execution_id": exec_id})
+    execute_resp = client.post(f"/flow/{exec_id}/execute")
     assert execute_resp.status_code == 200
 
     import time
@@ -46,7 +51,56 @@ def test_create_execute_and_status_flow():
     assert "start" in final_state["completed_tasks"]
     assert "end" in final_state["completed_tasks"]
 
+    list_resp = client.get("/flows")
+    assert list_resp.status_code == 200
+    assert exec_id in [flow["execution_id"] for flow in list_resp.json()]
+
+    batch_resp = client.post("/flows/status", json={"execution_ids": [exec_id, "missing"]})
+    assert batch_resp.status_code == 200
+    batch = batch_resp.json()
+    assert batch[exec_id]["status"] == "COMPLETED"
+    assert batch["missing"] is None
+
     delete_resp = client.delete(f"/flow/{exec_id}")
     assert delete_resp.status_code == 200
     assert "deleted successfully" in delete_resp.json().get("message", "")
 
+
+def test_batch_status_dedupes_ids(client):
+    response = client.post("/flows/status", json={"execution_ids": ["missing", "other", "missing"]})
+    assert response.status_code == 200
+    assert response.text == '{"missing":null,"other":null}'
+
+def test_create_flow_rejects_duplicate_task_names(client):
+    flow_config = {
+        "id": "api_flow_duplicates",
+        "name": "API Duplicate Names Flow",
+        "start_task": "a",
+        "tasks": [
+            {"name": "a", "task_type": "print", "parameters": {}},
+            {"name": "a", "task_type": "print", "parameters": {}},
+        ],
+        "conditions": []
+    }
+    response = client.post("/flow/create", json=flow_config)
+    assert response.status_code == 422
+
+def test_openapi_request_body_refs_resolve(client):
+    schema = client.get("/openapi.json").json()
+    components = schema["components"]["schemas"]
+    body = schema["paths"]["/flow/create"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert body == {"$ref": "#/components/schemas/FlowConfig"}
+
+    def refs(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                yield node["$ref"]
+            for value in node.values():
+                yield from refs(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from refs(value)
+
+    for ref in refs(schema):
+        assert ref.startswith("#/components/schemas/")
+        assert ref.rsplit("/", 1)[1] in components
@@ -0,0 +1,51 @@
+import pytest
+from flow_manager import FlowManager, FlowStatus
+
+@pytest.mark.asyncio
+async def test_finished_flows_are_evicted_first():
+    fm = FlowManager(max_flows=2)
+    flow_config = {
+        "id": "flow_eviction",
+        "name": "Eviction Flow",
+        "start_task": "task1",
+        "tasks": [
+            {"name": "task1", "task_type": "wait", "parameters": {"seconds": 0}},
+        ],
+        "conditions": []
+    }
+
+    running_id = fm.create_flow_execution(flow_config)
+    finished_id = fm.create_flow_execution(flow_config)
+    state = await fm.execute_flow(finished_id, flow_config)
+    assert state.status == FlowStatus.COMPLETED
+
+    newest_id = fm.create_flow_execution(flow_config)
+
+    assert fm.get_flow_status(finished_id) is None
+    assert fm.get_flow_config(finished_id) is None
+    assert fm.get_flow_status(running_id) is not None
+    assert fm.get_flow_status(newest_id) is not None
+
+@pytest.mark.asyncio
+async def test_flow_count_returns_to_cap_once_flows_finish():
+    fm = FlowManager(max_flows=2)
+    flow_config = {
+        "id": "flow_eviction_cap",
+        "name": "Eviction Cap Flow",
+        "start_task": "task1",
+        "tasks": [
+            {"name": "task1", "task_type": "wait", "parameters": {"seconds": 0}},
+        ],
+        "conditions": []
+    }
+
+    # None are finished yet, so the cap is exceeded until they run.
+    execution_ids = [fm.create_flow_execution(flow_config) for _ in range(5)]
+    assert len(fm.flows) == 5
+    for execution_id in execution_ids:
+        await fm.execute_flow(execution_id, flow_config)
+
+    newest_id = fm.create_flow_execution(flow_config)
+
+    assert len(fm.flows) == 2
+    assert fm.get_flow_status(newest_id) is not None
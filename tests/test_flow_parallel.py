@@ -0,0 +1,133 @@
+import pytest
+import time
+from flow_manager import FlowManager, FlowStatus, TaskStatus
+
+@pytest.mark.asyncio
+async def test_independent_tasks_run_concurrently():
+    fm = FlowManager()
+    flow_config = {
+        "id": "flow_parallel",
+        "name": "Parallel Flow",
+        "start_task": "task1",
+        "tasks": [
+            {"name": "task1", "task_type": "wait", "parameters": {"seconds": 0.3}, "depends_on": []},
+            {"name": "task2", "task_type": "wait", "parameters": {"seconds": 0.3}, "depends_on": []},
+            {"name": "task3", "task_type": "print", "parameters": {"message": "Task 3", "simulate_delay": False}, "depends_on": ["task1", "task2"]},
+        ],
+        "conditions": []
+    }
+
+    execution_id = fm.create_flow_execution(fm.load_flow_config(flow_config))
+    started = time.monotonic()
+    state = await fm.execute_flow(execution_id, flow_config)
+    elapsed = time.monotonic() - started
+
+    assert state.status == FlowStatus.COMPLETED
+    assert state.completed_tasks[-1] == "task3"
+    assert set(state.completed_tasks) == {"task1", "task2", "task3"}
+    assert all(result.status == TaskStatus.SUCCESS for result in state.task_results.values())
+    # Sequential would take 0.6s; concurrent waits take about 0.3s.
+    assert elapsed < 0.5
+
+@pytest.mark.asyncio
+async def test_task_starts_when_its_own_dependencies_finish():
+    fm = FlowManager()
+    flow_config = {
+        "id": "flow_critical_path",
+        "name": "Critical Path Flow",
+        "start_task": "slow",
+        "tasks": [
+            {"name": "slow", "task_type": "wait", "parameters": {"seconds": 0.4}, "depends_on": []},
+            {"name": "quick", "task_type": "wait", "parameters": {"seconds": 0.05}, "depends_on": []},
+            {"name": "after_quick", "task_type": "wait", "parameters": {"seconds": 0.4}, "depends_on": ["quick"]},
+        ],
+        "conditions": []
+    }
+
+    execution_id = fm.create_flow_execution(flow_config)
+    started = time.monotonic()
+    state = await fm.execute_flow(execution_id, flow_config)
+    elapsed = time.monotonic() - started
+
+    assert state.status == FlowStatus.COMPLETED
+    # The critical path is 0.45s; waiting for "slow" first would take 0.8s.
+    assert elapsed < 0.65
+
+@pytest.mark.asyncio
+async def test_same_type_tasks_respect_worker_limit():
+    fm = FlowManager()
+    fm.max_workers_per_type["wait"] = 1
+    flow_config = {
+        "id": "flow_bounded",
+        "name": "Bounded Flow",
+        "start_task": "task1",
+        "tasks": [
+            {"name": "task1", "task_type": "wait", "parameters": {"seconds": 0.2}, "depends_on": []},
+            {"name": "task2", "task_type": "wait", "parameters": {"seconds": 0.2}, "depends_on": []},
+        ],
+        "conditions": []
+    }
+
+    execution_id = fm.create_flow_execution(flow_config)
+    started = time.monotonic()
+    state = await fm.execute_flow(execution_id, flow_config)
+    elapsed = time.monotonic() - started
+
+    assert state.status == FlowStatus.COMPLETED
+    assert elapsed >= 0.4
+
+@pytest.mark.asyncio
+async def test_worker_limit_change_applies_to_later_runs():
+    fm = FlowManager()
+    fm.max_workers_per_type["wait"] = 1
+    flow_config = {
+        "id": "flow_relimited",
+        "name": "Relimited Flow",
+        "start_task": "task1",
+        "tasks": [
+            {"name": "task1", "task_type": "wait", "parameters": {"seconds": 0.2}, "depends_on": []},
+            {"name": "task2", "task_type": "wait", "parameters": {"seconds": 0.2}, "depends_on": []},
+        ],
+        "conditions": []
+    }
+    await fm.execute_flow(fm.create_flow_execution(flow_config), flow_config)
+
+    fm.max_workers_per_type["wait"] = 2
+    started = time.monotonic()
+    state = await fm.execute_flow(fm.create_flow_execution(flow_config), flow_config)
+    elapsed = time.monotonic() - started
+
+    assert state.status == FlowStatus.COMPLETED
+    assert elapsed < 0.35
+
+def test_unknown_dependency_is_rejected():
+    fm = FlowManager()
+    flow_config = {
+        "id": "flow_bad_dependency",
+        "name": "Bad Dependency Flow",
+        "start_task": "task1",
+        "tasks": [
+            {"name": "task1", "task_type": "print", "parameters": {}, "depends_on": ["missing"]},
+        ],
+        "conditions": []
+    }
+
+    with pytest.raises(ValueError):
+        fm.load_flow_config(flow_config)
+
+def test_duplicate_task_names_are_rejected():
+    fm = FlowManager()
+    flow_config = {
+        "id": "flow_duplicate_names",
+        "name": "Duplicate Names Flow",
+        "start_task": "a",
+        "tasks": [
+            {"name": "a", "task_type": "print", "parameters": {}},
+            {"name": "b", "task_type": "print", "parameters": {}},
+            {"name": "a", "task_type": "print", "parameters": {}},
+        ],
+        "conditions": []
+    }
+
+    with pytest.raises(ValueError):
+        fm.load_flow_config(flow_config)
@@ -0,0 +1,81 @@
+import pytest
+import asyncio
+from flow_manager import FlowManager
+from tasks.base_task import BaseTask
+
+class CountingTask(BaseTask):
+    cacheable = True
+    runs = 0
+
+    async def run(self) -> dict:
+        CountingTask.runs += 1
+        await asyncio.sleep(0.01)
+        return {"value": self.parameters["value"]}
+
+@pytest.mark.asyncio
+async def test_cacheable_task_runs_once_per_parameters():
+    fm = FlowManager()
+    CountingTask.runs = 0
+
+    first, second = await asyncio.gather(
+        fm._run_instance("counting", CountingTask(name="a", parameters={"value": 1})),
+        fm._run_instance("counting", CountingTask(name="b", parameters={"value": 1})),
+    )
+    third = await fm._run_instance("counting", CountingTask(name="c", parameters={"value": 1}))
+    other = await fm._run_instance("counting", CountingTask(name="d", parameters={"value": 2}))
+
+    assert first == second == third == {"value": 1}
+    assert other == {"value": 2}
+    assert CountingTask.runs == 2
+
+@pytest.mark.asyncio
+async def test_memoize_parameter_enables_cache_per_task():
+    fm = FlowManager()
+    CountingTask.runs = 0
+
+    class PlainTask(CountingTask):
+        cacheable = False
+
+    await fm._run_instance("plain", PlainTask(name="a", parameters={"value": 1}))
+    await fm._run_instance("plain", PlainTask(name="b", parameters={"value": 1}))
+    assert CountingTask.runs == 2
+
+    await fm._run_instance("plain", PlainTask(name="c", parameters={"value": 1, "memoize": True}))
+    await fm._run_instance("plain", PlainTask(name="d", parameters={"value": 1, "memoize": True}))
+    assert CountingTask.runs == 3
+
+class FlakyTask(BaseTask):
+    cacheable = True
+    runs = 0
+
+    async def run(self) -> dict:
+        FlakyTask.runs += 1
+        await asyncio.sleep(0.02)
+        if FlakyTask.runs == 1:
+            raise RuntimeError("first run fails")
+        return {"runs": FlakyTask.runs}
+
+@pytest.mark.asyncio
+async def test_failed_memoized_call_is_retried():
+    fm = FlowManager()
+    FlakyTask.runs = 0
+
+    with pytest.raises(RuntimeError):
+        await fm._run_instance("flaky", FlakyTask(name="a", parameters={}))
+    assert await fm._run_instance("flaky", FlakyTask(name="b", parameters={})) == {"runs": 2}
+
+@pytest.mark.asyncio
+async def test_failure_after_awaiter_cancelled_is_retried():
+    fm = FlowManager()
+    FlakyTask.runs = 0
+
+    waiter = asyncio.ensure_future(fm._run_instance("flaky", FlakyTask(name="a", parameters={})))
+    await asyncio.sleep(0.005)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    # Let the shielded run finish and fail with nobody awaiting it.
+    await asyncio.sleep(0.05)
+
+    assert await fm._run_instance("flaky", FlakyTask(name="b", parameters={})) == {"runs": 2}
+    assert FlakyTask.runs == 2